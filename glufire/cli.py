@@ -5,7 +5,7 @@ from pathlib import Path
 import json # Import the json module
 
 from glufire.models.and_gate import SimpleANDGate
-from glufire.models.diffusion_pk_neurotoxicity import simulate_three_comp_pk, assess_neurotoxicity, PKParams, ToxicityThresholds, trapezoid_flux, _plot_and_save
+from glufire.models.diffusion_pk_neurotoxicity import simulate_three_comp_pk, assess_neurotoxicity, PKParams, ToxicityThresholds, trapezoid_flux_vec, time_grid, _plot_and_save
 from glufire.models.glu_metabolism import GluModel, create_heat_shock_protocol
 
 
@@ -266,20 +266,16 @@ def diffusion(hours, dt, baseline, tumor_init_mm, k_bt, k_b_clr, k_t_clr, secret
     baseline_uM = baseline
     Ct0_uM = tumor_init_mm * 1000.0  # convert mM -> µM
 
-    t_h = np.linspace(0.0, sim_hours, int(sim_hours / dt) + 1)
+    t_h = time_grid(sim_hours, dt)
 
+    S_t = None
     if secretion_peak > 0.0:
-        S_t = np.array([
-            trapezoid_flux(t,
-                           t_on=t_on,
-                           t_plateau=t_on + ramp,
-                           t_off=t_off,
-                           ramp_hours=ramp,
-                           peak_umol_per_h=secretion_peak)
-            for t in t_h
-        ], dtype=float)
-    else:
-        S_t = np.zeros_like(t_h)
+        S_t = trapezoid_flux_vec(t_h,
+                                 t_on=t_on,
+                                 t_plateau=t_on + ramp,
+                                 t_off=t_off,
+                                 ramp_hours=ramp,
+                                 peak_umol_per_h=secretion_peak)
 
     params = PKParams(
         k_bt=k_bt,
@@ -299,7 +295,7 @@ def diffusion(hours, dt, baseline, tumor_init_mm, k_bt, k_b_clr, k_t_clr, secret
 
     Cb_ctrl, Ct_ctrl, Cn_ctrl = simulate_three_comp_pk(
         t_grid_h=t_h,
-        S_t_umol_per_h=np.zeros_like(S_t),
+        S_t_umol_per_h=None,
         params=params,
         Cb0_uM=baseline_uM,
         Ct0_uM=baseline_uM,
@@ -10,11 +10,8 @@ Core Functions:
 Author: CUHK-shenzhen iGEM Modeling Team
 Date: 2025
 """
-import json
-from pathlib import Path
 import numpy as np
 import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import os
 
 # ------------------------------------------------------------------
@@ -59,20 +56,26 @@ class SimpleANDGate:
     
     def __init__(self, promoter_params=None, splitT7_params=None):
         if promoter_params is None or splitT7_params is None:
-            promoter_params, splitT7_params = load_model_parameters()
+            default_promoters, default_splitT7 = load_model_parameters()
+            if promoter_params is None:
+                promoter_params = default_promoters
+            if splitT7_params is None:
+                splitT7_params = default_splitT7
         self.promoter_params = promoter_params
         self.splitT7_params = splitT7_params
 
     def _hill_function(self, x, params):
         """Hill function calculation, supports activator and repressor types"""
-        x = np.asarray(x, dtype=float)
-        leaky, beta, K, n = params['leaky'], params['beta'], params['K'], params['n']
-        ptype = params.get('type', 'act')
-        
-        if ptype == 'rep':  # Repressor type
-            return leaky + beta * (K**n) / (K**n + x**n)
+        # Plain floats stay scalar (no numpy array allocation); anything else is element-wise
+        x = float(x) if isinstance(x, (int, float)) else np.asarray(x, dtype=float)
+        leaky, beta, n = params['leaky'], params['beta'], params['n']
+        Kn = params['K']**n
+        xn = x**n
+        
+        if params.get('type', 'act') == 'rep':  # Repressor type
+            return leaky + beta * Kn / (Kn + xn)
         else:  # Activator type
-            return leaky + beta * (x**n) / (K**n + x**n)
+            return leaky + beta * xn / (Kn + xn)
     
     def _temperature_response_function(self, T_celsius, params):
         """
@@ -114,15 +117,29 @@ class SimpleANDGate:
         pLR_out = self._temperature_response_function(Temp_C, self.promoter_params['pLR'])
         return pPepT_out, pLR_out
 
-    def get_t7_activity(self, O2_percent, Temp_C):
-        """Calculate T7 activity, AND gate core logic"""
-        A, B = self.get_promoter_outputs(O2_percent, Temp_C)
+    def _split_t7_response(self, A, B):
+        """Split T7 reassembly from promoter outputs (broadcasts over arrays)"""
         alpha = self.splitT7_params['alpha']
         Kd = self.splitT7_params['Kd']
         leaky = self.splitT7_params.get('leaky', 0.0)
         product = A * B
         return leaky + alpha * product / (Kd + product)
 
+    def get_t7_activity(self, O2_percent, Temp_C):
+        """Calculate T7 activity, AND gate core logic
+
+        O2_percent and Temp_C may be scalars or broadcastable arrays,
+        e.g. O2[:, None] and T[None, :] for a full condition grid.
+        """
+        A, B = self.get_promoter_outputs(O2_percent, Temp_C)
+        return self._split_t7_response(A, B)
+
+    def get_t7_activity_grid(self, O2_list, Temp_list):
+        """T7 activity for every (O2, Temp) pair, shape (len(O2_list), len(Temp_list))"""
+        O2 = np.asarray(O2_list, dtype=float)[:, None]
+        Temp = np.asarray(Temp_list, dtype=float)[None, :]
+        return self.get_t7_activity(O2, Temp)
+
     def quick_diagnose(self, O2_list=(1.0, 5.0, 21.0), Temp_list=(37.0, 42.0, 45.0)):
         """Quick diagnosis: print expression and T7 output under typical conditions"""
         print("\n=== Quick Diagnosis ===")
@@ -135,11 +152,16 @@ class SimpleANDGate:
         print(f"  splitT7: α={self.splitT7_params['alpha']:.0f}, Kd={self.splitT7_params['Kd']:.0f}")
         
         print("\nCondition scan (T7 activity):")
-        for o2 in O2_list:
-            for T in Temp_list:
-                t7 = self.get_t7_activity(o2, T)
-                p1, p2 = self.get_promoter_outputs(o2, T)
-                print(f"  O₂={o2:5.1f}%  T={T:4.1f}°C  pPepT={p1:6.0f}  pLR={p2:6.0f}  T7={t7:6.0f} AU")
+        # Evaluate the whole O2 x Temp grid in one broadcast pass
+        O2_grid, T_grid = np.meshgrid(np.asarray(O2_list, dtype=float),
+                                      np.asarray(Temp_list, dtype=float), indexing='ij')
+        p1_grid, p2_grid = self.get_promoter_outputs(O2_grid, T_grid)
+        t7_grid = self._split_t7_response(p1_grid, p2_grid)
+        rows = zip(O2_grid.ravel(), T_grid.ravel(), p1_grid.ravel(), p2_grid.ravel(), t7_grid.ravel())
+        print("\n".join(
+            f"  O₂={o2:5.1f}%  T={T:4.1f}°C  pPepT={p1:6.0f}  pLR={p2:6.0f}  T7={t7:6.0f} AU"
+            for o2, T, p1, p2, t7 in rows
+        ))
 
     # ------------------------------------------------------------------
     # Visualization Functions
@@ -154,8 +176,8 @@ class SimpleANDGate:
         
         ax1.semilogx(O2_range, pPepT_response, 'b-', linewidth=2, label='pPepT Response')
         # Add experimental data points
-        exp_O2 = [1.0, 2.0, 5.0, 10.0, 21.0]
-        exp_pPepT = [self._hill_function(o2, self.promoter_params['pPepT']) for o2 in exp_O2]
+        exp_O2 = np.array([1.0, 2.0, 5.0, 10.0, 21.0])
+        exp_pPepT = self._hill_function(exp_O2, self.promoter_params['pPepT'])
         ax1.scatter(exp_O2, exp_pPepT, color='orange', s=60, zorder=5, label='Data Points')
         
         ax1.set_xlabel('Oxygen (%)')
@@ -170,8 +192,8 @@ class SimpleANDGate:
         
         ax2.plot(T_range, pLR_response, 'orange', linewidth=2, label='pLR Response')
         # Add experimental data points
-        exp_T = [37.0, 39.0, 42.0, 43.0, 45.0]
-        exp_pLR = [self._temperature_response_function(t, self.promoter_params['pLR']) for t in exp_T]
+        exp_T = np.array([37.0, 39.0, 42.0, 43.0, 45.0])
+        exp_pLR = self._temperature_response_function(exp_T, self.promoter_params['pLR'])
         ax2.scatter(exp_T, exp_pLR, color='blue', s=60, zorder=5, label='Data Points')
         
         ax2.set_xlabel('Temperature (°C)')
@@ -184,7 +206,7 @@ class SimpleANDGate:
         O2_levels = np.logspace(-1, 1.3, 50)  # Increase resolution
         Temp_levels = np.linspace(35, 47, 50)  # Increase resolution
         O2_grid, Temp_grid = np.meshgrid(O2_levels, Temp_levels)
-        T7_activity = self.get_t7_activity(O2_grid, Temp_grid)
+        T7_activity = self.get_t7_activity_grid(O2_levels, Temp_levels).T
         
         # Ensure reasonable data range
         print(f"T7 activity range: {np.min(T7_activity):.1f} - {np.max(T7_activity):.1f}")
@@ -219,7 +241,7 @@ class SimpleANDGate:
                                np.where(time < 6, 37.0 + (42.0-37.0)*(time-4)/2, 42.0))
         
         # Calculate T7 activity over time (assuming low oxygen condition 1%)
-        t7_activity = [self.get_t7_activity(1.0, t) for t in temp_profile]
+        t7_activity = self.get_t7_activity(1.0, temp_profile)
         
         ax4.plot(time, t7_activity, 'b-', linewidth=2, label='T7 Activity')
         ax4_temp = ax4.twinx()
@@ -254,7 +276,7 @@ class SimpleANDGate:
         O2_levels = np.clip(O2_levels, 0.1, None)
         Temp_levels = np.linspace(35, 47, 30)
         O2_grid, Temp_grid = np.meshgrid(O2_levels, Temp_levels)
-        T7_activity = self.get_t7_activity(O2_grid, Temp_grid)
+        T7_activity = self.get_t7_activity_grid(O2_levels, Temp_levels).T
         
         fig, ax = plt.subplots(figsize=(10, 8))
         im = ax.contourf(O2_grid, Temp_grid, T7_activity, levels=20, cmap='Blues_r')
@@ -2,11 +2,10 @@
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Tuple
+from typing import Dict, Optional
 
 import numpy as np
-from scipy.integrate import solve_ivp
-import matplotlib.pyplot as plt
+from scipy.linalg import expm
 
 
 # ---------------------- Data classes ---------------------- #
@@ -39,11 +38,6 @@ class ToxicityThresholds:
 
 # ---------------------- Helpers ---------------------- #
 
-def _interp_series(t_query: float, t_src: np.ndarray, y_src: np.ndarray) -> float:
-    """Linear interpolation helper: y(t_query) ← (t_src, y_src)."""
-    return float(np.interp(t_query, t_src, y_src))
-
-
 def trapezoid_flux(t: float,
                    t_on: float, t_plateau: float, t_off: float,
                    ramp_hours: float, peak_umol_per_h: float) -> float:
@@ -63,75 +57,142 @@ def trapezoid_flux(t: float,
     return 0.0
 
 
+def trapezoid_flux_vec(t: np.ndarray,
+                       t_on: float, t_plateau: float, t_off: float,
+                       ramp_hours: float, peak_umol_per_h: float) -> np.ndarray:
+    """Vectorized trapezoid_flux over an array of times (same branch precedence)."""
+    t = np.asarray(t, dtype=float)
+    up   = (t_on <= t) & (t < t_on + ramp_hours)
+    plat = (t_on + ramp_hours <= t) & (t < t_off)
+    down = (t_off <= t) & (t < t_off + ramp_hours)
+    # np.select evaluates every branch; with ramp_hours=0 the ramp masks are empty
+    # and their (inf/nan) values are never selected, so silence the division
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.select(
+            [up, plat, down],
+            [peak_umol_per_h * (t - t_on) / ramp_hours,
+             peak_umol_per_h,
+             peak_umol_per_h * (1 - (t - t_off) / ramp_hours)],
+            default=0.0,
+        )
+
+
+def time_grid(sim_hours: float, dt_h: float) -> np.ndarray:
+    """
+    Output grid 0, dt_h, 2*dt_h, ... ending exactly at sim_hours.
+    When sim_hours is not a multiple of dt_h the last step is shorter
+    (the count tolerates float noise, e.g. 0.3/0.1 gives 3 full steps).
+    """
+    t_h = np.arange(int(np.ceil(sim_hours / dt_h - 1e-9)) + 1) * dt_h
+    t_h[-1] = sim_hours
+    return t_h
+
+
 # ---------------------- Core PK ---------------------- #
 
 def simulate_three_comp_pk(
     t_grid_h: np.ndarray,
-    S_t_umol_per_h: np.ndarray,
+    S_t_umol_per_h: Optional[np.ndarray],
     params: PKParams = PKParams(),
     Cb0_uM: float = 50.0,   # start from baseline for clarity on plots
     Ct0_uM: float = 50.0,
     Cn0_uM: float = 50.0,
     baseline_uM: float = 50.0,
     debug: bool = False,
-) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+) -> np.ndarray:
     """
     Three-compartment PK (blood/plasma b, tumor t, normal tissues n).
-    State y = [Cb, Ct, Cn] in µM. External input S_t(t) (µmol/h) acts on the tumor compartment.
+    State y = [Cb, Ct, Cn] in µM. External input S_t(t) (µmol/h) acts on the tumor compartment;
+    pass None for no secretion.
 
     Returns
     -------
-    (Cb, Ct, Cn): tuple of arrays, each aligned to t_grid_h (µM).
+    y: array of shape (3, len(t_grid_h)) in µM, rows Cb, Ct, Cn
+       (unpacks as ``Cb, Ct, Cn = simulate_three_comp_pk(...)``).
     """
-    t0, t1 = float(t_grid_h[0]), float(t_grid_h[-1])
+    t_grid_h = np.asarray(t_grid_h, dtype=float)
+    secreting = S_t_umol_per_h is not None and np.any(S_t_umol_per_h)
+    if secreting:
+        S_t_umol_per_h = np.asarray(S_t_umol_per_h, dtype=float)
+
+    # Everything at baseline with no secretion is the steady state: y(t) ≡ baseline
+    if Cb0_uM == Ct0_uM == Cn0_uM == baseline_uM and not secreting:
+        return np.full((3, len(t_grid_h)), float(baseline_uM))
 
     Vb, Vt, Vn = params.Vb, params.Vt, params.Vn
     kbt, kbn = params.k_bt, params.k_bn
     kbclr, ktclr, knclr = params.k_b_clr, params.k_t_clr, params.k_n_clr
 
-    def rhs(t, y):
-        Cb, Ct, Cn = y
-        S_t = _interp_series(t, t_grid_h, S_t_umol_per_h)  # µmol/h
-
-        if debug:
-            if not hasattr(rhs, "_dbg"):
-                rhs._dbg = 0
-            if rhs._dbg < 3:
-                print(f"[DBG rhs] t={t:.3f} h, S_t={S_t:.4g} µmol/h, "
-                      f"Cb={Cb:.3f}, Ct={Ct:.3f}, Cn={Cn:.3f}")
-                rhs._dbg += 1
-
-        # Plasma
-        dCb = (
-            - kbt * (Cb - Ct)             # blood <-> tumor exchange
-            - kbn * (Cb - Cn)             # blood <-> normal tissues
-            - kbclr * (Cb - baseline_uM)  # clearance to baseline
-        )
-        # Tumor
-        dCt = (
-            + (Vb / Vt) * kbt * (Cb - Ct) # mass conservation exchange
-            - ktclr * (Ct - baseline_uM)  # local clearance
-            + S_t / Vt                    # µmol/h → µM/h
-        )
-        # Normal tissues
-        dCn = (
-            + (Vb / Vn) * kbn * (Cb - Cn)
-            - knclr * (Cn - baseline_uM)
-        )
-        return [dCb, dCt, dCn]
+    # The model is linear: dy/dt = A y + f(t), with
+    #   plasma: blood <-> tumor, blood <-> normal tissues, clearance to baseline
+    #   tumor:  mass-conserving exchange, local clearance, secretion S_t / Vt (µmol/h → µM/h)
+    #   normal: mass-conserving exchange, clearance to baseline
+    A = np.array([
+        [-(kbt + kbn + kbclr),  kbt,                       kbn],
+        [(Vb / Vt) * kbt,       -((Vb / Vt) * kbt + ktclr), 0.0],
+        [(Vb / Vn) * kbn,       0.0,                       -((Vb / Vn) * kbn + knclr)],
+    ])
+    f = np.empty((len(t_grid_h), 3))
+    f[:, 0] = kbclr * baseline_uM
+    f[:, 1] = ktclr * baseline_uM
+    if secreting:
+        f[:, 1] += S_t_umol_per_h / Vt
+    f[:, 2] = knclr * baseline_uM
+
+    # S_t is linear between grid points, so each step is solved exactly:
+    #   y[k+1] = Phi y[k] + G0 f[k] + G1 (f[k+1] - f[k])
+    # with Phi, G0, G1 read off one block matrix exponential (Van Loan).
+    def _step_matrices(h):
+        M = np.zeros((9, 9))
+        M[0:3, 0:3] = A * h
+        M[0:3, 3:6] = np.eye(3) * h
+        M[3:6, 6:9] = np.eye(3)
+        E = expm(M)
+        return E[0:3, 0:3], E[0:3, 3:6], E[0:3, 6:9]
+
+    # Steps of the grid's leading size (all of them on a uniform grid, all but a
+    # shortened last step on a pinned one) share one set of matrices
+    steps = np.diff(t_grid_h)
+    uniform = np.zeros(len(steps), dtype=bool)
+    if len(steps):
+        uniform = np.isclose(steps, steps[0], rtol=1e-9, atol=0.0)
+        Phi, G0, G1 = _step_matrices(steps[0])
+        forcing = f[:-1] @ G0.T + (f[1:] - f[:-1]) @ G1.T
+
+    y = np.empty((len(t_grid_h), 3))
+    y[0] = (Cb0_uM, Ct0_uM, Cn0_uM)
+    for k in range(len(steps)):
+        if uniform[k]:
+            y[k + 1] = Phi @ y[k] + forcing[k]
+        else:
+            Phi_k, G0_k, G1_k = _step_matrices(steps[k])
+            y[k + 1] = Phi_k @ y[k] + G0_k @ f[k] + G1_k @ (f[k + 1] - f[k])
+
+        if debug and k < 3:
+            S_k = S_t_umol_per_h[k + 1] if secreting else 0.0
+            print(f"[DBG step] t={t_grid_h[k + 1]:.3f} h, S_t={S_k:.4g} µmol/h, "
+                  f"Cb={y[k + 1, 0]:.3f}, Ct={y[k + 1, 1]:.3f}, Cn={y[k + 1, 2]:.3f}")
+
+    return np.ascontiguousarray(y.T)
 
-    sol = solve_ivp(
-        rhs, (t0, t1), [Cb0_uM, Ct0_uM, Cn0_uM],
-        t_eval=t_grid_h, method="LSODA", rtol=1e-6, atol=1e-9
-    )
-    if not sol.success:
-        raise RuntimeError(f"PK ODE failed: {sol.message}")
 
-    Cb, Ct, Cn = sol.y
-    return Cb, Ct, Cn
+# ---------------------- Toxicity assessment ---------------------- #
+
+def _time_above(c: np.ndarray, dt: np.ndarray, level: float) -> float:
+    """Time (h) the piecewise-linear curve c(t) spends at or above level; dt = np.diff(t)."""
+    c0, c1 = c[:-1], c[1:]
+    above0 = c0 >= level
+    above1 = c1 >= level
 
+    total = float(np.sum(dt[above0 & above1]))
+    cross = np.flatnonzero(above0 != above1)
+    if cross.size:
+        # Fraction of each crossing segment spent above the level
+        hi = np.maximum(c0[cross], c1[cross])
+        frac = (hi - level) / np.abs(c1[cross] - c0[cross])
+        total += float(np.sum(frac * dt[cross]))
+    return total
 
-# ---------------------- Toxicity assessment ---------------------- #
 
 def assess_neurotoxicity(
     Cb_uM: np.ndarray,
@@ -147,19 +208,18 @@ def assess_neurotoxicity(
     t_h   = np.asarray(t_h,   dtype=float)
 
     Cb_max = float(np.max(Cb_uM))
-    above_caution = Cb_uM >= thr.caution_um
-    above_danger  = Cb_uM >= thr.danger_um
 
-    # Approximate cumulative time above thresholds (hours) by trapezoid integration of boolean masks
-    t_above_caution_h = float(np.trapz(above_caution.astype(float), t_h))
-    t_above_danger_h  = float(np.trapz(above_danger.astype(float),  t_h))
+    # Cumulative time above thresholds (hours), with exact crossings of the linearly interpolated curve
+    dt_h = np.diff(t_h)
+    t_above_caution_h = _time_above(Cb_uM, dt_h, thr.caution_um)
+    t_above_danger_h  = _time_above(Cb_uM, dt_h, thr.danger_um)
 
     return {
         "Cb_max_uM": Cb_max,
         "time_above_caution_h": t_above_caution_h,
         "time_above_danger_h":  t_above_danger_h,
-        "flag_caution": bool(np.any(above_caution)),
-        "flag_danger":  bool(np.any(above_danger)),
+        "flag_caution": Cb_max >= thr.caution_um,
+        "flag_danger":  Cb_max >= thr.danger_um,
         "caution_threshold_uM": thr.caution_um,
         "danger_threshold_uM":  thr.danger_um,
     }
@@ -188,6 +248,8 @@ def _build_cli():
     ap.add_argument("--outdir", type=str, default="results", help="Output root directory")
     ap.add_argument("--title", type=str, default="Plasma Glutamate vs Neurotoxicity Thresholds",
                     help="Figure title")
+    ap.add_argument("--dpi", type=int, default=200, help="Figure resolution (e.g. 100 for previews, 300 for print)")
+    ap.add_argument("--no-plot", action="store_true", help="Only print the risk report; skip the figure")
     return ap
 
 
@@ -197,23 +259,29 @@ def _plot_and_save(t_h: np.ndarray,
                    thresholds: ToxicityThresholds,
                    t_on: float, t_off: float,
                    out_png: Path,
-                   title: str = "Plasma Glutamate vs Neurotoxicity Thresholds") -> None:
+                   title: str = "Plasma Glutamate vs Neurotoxicity Thresholds",
+                   dpi: int = 200) -> None:
     """Make the neurotoxicity figure and save it."""
-    fig, ax = plt.subplots(figsize=(9, 5))
+    # Imported here so report-only runs skip matplotlib; a standalone Figure
+    # (no pyplot state) renders the PNG with Agg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(9, 5))
+    ax = fig.subplots()
 
     # Main axis: plasma curves
     ax.plot(t_h, Cb, color='blue', label="Plasma Glu (treatment)")
     ax.plot(t_h, Cb_ctrl, color='orange', linestyle="--", alpha=0.9, label="Plasma Glu (control)")
 
     # Choose y-limits to show baseline and thresholds
-    span = float(max(Cb.max(), Cb_ctrl.max()) - min(Cb.min(), Cb_ctrl.min()))
+    lo = float(min(Cb.min(), Cb_ctrl.min()))
+    hi = float(max(Cb.max(), Cb_ctrl.max()))
+    span = hi - lo
     if span < 5.0:
         pad = max(1.0, 0.15 * max(1.0, span))
-        ylo = float(min(Cb.min(), Cb_ctrl.min()) - pad)
-        yhi = float(max(Cb.max(), Cb_ctrl.max()) + pad)
+        ylo = lo - pad
+        yhi = hi + pad
     else:
-        lo = min(Cb.min(), Cb_ctrl.min())
-        hi = max(Cb.max(), Cb_ctrl.max())
         ylo, yhi = min(45, lo - 2), max(110, hi + 2)
 
     # Ensure the caution threshold is visible
@@ -225,29 +293,10 @@ def _plot_and_save(t_h: np.ndarray,
     ax.axhline(thresholds.caution_um, ls="--", lw=1.2, alpha=0.6, label=f"Caution {thresholds.caution_um:.0f} µM")
     ax.axhline(thresholds.danger_um,  ls="--", lw=1.2, alpha=0.6, label="Danger 1.0 mM")
 
-    # Right axis only for the secretion window shading; keep y synced for visual alignment
-    ax2 = ax.twinx()
-    ax2.set_ylim(ax.get_ylim())
-    ax2.set_yticks([])
-
-    def _sync_ylim(_):
-        ax2.set_ylim(ax.get_ylim())
-    ax.callbacks.connect('ylim_changed', _sync_ylim)
-
-    ax2.axvspan(t_on, t_off, alpha=0.15, color='blue', label="Tumor secretion window")
-
-    # Merge legends
-    handles, labels = [], []
-    for a in (ax, ax2):
-        h, l = a.get_legend_handles_labels()
-        handles += h
-        labels  += l
-    seen, H, L = set(), [], []
-    for h, l in zip(handles, labels):
-        if l in seen:
-            continue
-        seen.add(l); H.append(h); L.append(l)
-    ax.legend(H, L, loc="upper right", framealpha=0.9)
+    # Secretion window shading spans the full axes height
+    ax.axvspan(t_on, t_off, alpha=0.15, color='blue', label="Tumor secretion window")
+
+    ax.legend(loc="upper right", framealpha=0.9)
 
     ax.set_xlabel("Time (h)")
     ax.set_ylabel("Concentration (µM)")
@@ -256,8 +305,8 @@ def _plot_and_save(t_h: np.ndarray,
 
     fig.tight_layout()
     out_png.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(out_png, dpi=200)
-    plt.close(fig)
+    # Fast zlib level: same pixels, ~20% larger file, quicker PNG encode
+    fig.savefig(out_png, dpi=dpi, pil_kwargs={"compress_level": 1})
 
 
 def main():
@@ -271,21 +320,17 @@ def main():
     Ct0_uM = float(args.tumor_init_mM) * 1000.0  # convert mM → µM
 
     # Time grid
-    t_h = np.linspace(0.0, sim_hours, int(sim_hours / dt_h) + 1)
+    t_h = time_grid(sim_hours, dt_h)
 
-    # Optional trapezoid secretion profile (disabled if peak=0)
+    # Optional trapezoid secretion profile (None disables it when peak=0)
+    S_t = None
     if float(args.secretion_peak) > 0.0:
-        S_t = np.array([
-            trapezoid_flux(t,
-                           t_on=float(args.t_on),
-                           t_plateau=float(args.t_on) + float(args.ramp),
-                           t_off=float(args.t_off),
-                           ramp_hours=float(args.ramp),
-                           peak_umol_per_h=float(args.secretion_peak))
-            for t in t_h
-        ], dtype=float)
-    else:
-        S_t = np.zeros_like(t_h)
+        S_t = trapezoid_flux_vec(t_h,
+                                 t_on=float(args.t_on),
+                                 t_plateau=float(args.t_on) + float(args.ramp),
+                                 t_off=float(args.t_off),
+                                 ramp_hours=float(args.ramp),
+                                 peak_umol_per_h=float(args.secretion_peak))
 
     # PK parameters (use your tuned values: weak blood<->tumor coupling + slower tumor clearance)
     params = PKParams(
@@ -310,7 +355,7 @@ def main():
     # Control: all compartments start at baseline; no secretion
     Cb_ctrl, Ct_ctrl, Cn_ctrl = simulate_three_comp_pk(
         t_grid_h=t_h,
-        S_t_umol_per_h=np.zeros_like(S_t),
+        S_t_umol_per_h=None,
         params=params,
         Cb0_uM=baseline_uM,
         Ct0_uM=baseline_uM,
@@ -318,10 +363,8 @@ def main():
         baseline_uM=baseline_uM,
     )
 
-    # Numeric check of elevation (not just visually)
-    dCb = Cb - baseline_uM
-    dCt = Ct - baseline_uM
-    print(f"[DBG] ΔCb_max = {float(np.max(dCb)):.6f} µM, ΔCt_max = {float(np.max(dCt)):.6f} µM")
+    # Numeric check of elevation (not just visually); max(C) - baseline == max(C - baseline)
+    print(f"[DBG] ΔCb_max = {float(Cb.max()) - baseline_uM:.6f} µM, ΔCt_max = {float(Ct.max()) - baseline_uM:.6f} µM")
 
     # Risk assessment
     thr = ToxicityThresholds()
@@ -336,21 +379,23 @@ def main():
     for k, v in report_ctrl.items():
         print(f"{k}: {v}")
 
-    # Output path (timestamped folder; no "The figure is saved to:" line)
-    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    outdir = Path(args.outdir) / f"neurotoxicity_{stamp}"
-    out_png = outdir / "plasma_glu_neurotoxicity.png"
-
-    print(f"\n[INFO] Writing figure -> {out_png}")
-    _plot_and_save(
-        t_h=t_h,
-        Cb=Cb, Cb_ctrl=Cb_ctrl,
-        baseline_uM=baseline_uM,
-        thresholds=thr,
-        t_on=float(args.t_on), t_off=float(args.t_off),
-        out_png=out_png,
-        title=args.title,
-    )
+    if not args.no_plot:
+        # Output path (timestamped folder; no "The figure is saved to:" line)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        outdir = Path(args.outdir) / f"neurotoxicity_{stamp}"
+        out_png = outdir / "plasma_glu_neurotoxicity.png"
+
+        print(f"\n[INFO] Writing figure -> {out_png}")
+        _plot_and_save(
+            t_h=t_h,
+            Cb=Cb, Cb_ctrl=Cb_ctrl,
+            baseline_uM=baseline_uM,
+            thresholds=thr,
+            t_on=float(args.t_on), t_off=float(args.t_off),
+            out_png=out_png,
+            title=args.title,
+            dpi=args.dpi,
+        )
 
     print("[INFO] Done.")
     print("[INFO] Params:", asdict(params))
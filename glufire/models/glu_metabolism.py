@@ -9,6 +9,8 @@ Core Functions:
 - Wild-type: homeostatic control, no response to heat shock
 """
 
+from math import exp
+
 import numpy as np
 from scipy.integrate import odeint
 
@@ -18,7 +20,16 @@ class GluModel:
     
     State Variables:
     - [Glc_ext, NH4_ext, ICIT, AKG, Glu_in, NADPH, X, Glu_ext, fold_ICD, fold_GDH]
+
+    GluModel(strain_type=...) returns the strain-specific subclass
+    (EngineeredGluModel or WildtypeGluModel), so the RHS never branches on
+    the strain name.
     """
+
+    def __new__(cls, strain_type='engineered', **params):
+        if cls is GluModel:
+            cls = WildtypeGluModel if strain_type == 'wildtype' else EngineeredGluModel
+        return super().__new__(cls)
     
     def __init__(self, strain_type='engineered', **params):
         """Initialize model"""
@@ -56,35 +67,179 @@ class GluModel:
         self.tau_enzyme = params.get('tau_enzyme', 0.05)
         
         # Strain-specific parameters
-        if strain_type == 'wildtype':
-            self.fold_ICD_max = 1.0
-            self.fold_GDH_max = 1.0
-            self.homeostasis_strength = 5.0
-        else:
-            self.fold_ICD_max = params.get('fold_ICD_max', 1000.0)
-            self.fold_GDH_max = params.get('fold_GDH_max', 1500.0)
-            self.homeostasis_strength = 2.0
-            self.accum_threshold = params.get('accum_threshold', 55.0)
-            self.export_accum_suppression = params.get('export_accum_suppression', 0.05)
-            self.postshock_export_boost = params.get('postshock_export_boost', 10.0)
-            self.extracellular_clearance_rate = params.get('extracellular_clearance_rate', 0.5)
-            self.export_decay_rate = params.get('export_decay_rate', 0.8)
+        self._init_strain_params(params)
         
         self.Glu_target = 20.0
         
+    def glucose_saturation(self, Glc_ext):
+        """Monod glucose term shared by growth and uptake"""
+        return Glc_ext / (self.K_m_glc + Glc_ext)
+
     def calculate_growth_rate(self, Glc_ext):
-        return self.mu_max * Glc_ext / (self.K_m_glc + Glc_ext)
+        return self.mu_max * self.glucose_saturation(Glc_ext)
     
-    def calculate_glucose_uptake(self, Glc_ext, X):
-        return self.V_max_glc * Glc_ext / (self.K_m_glc + Glc_ext)
+    def calculate_glucose_uptake(self, Glc_ext):
+        return self.V_max_glc * self.glucose_saturation(Glc_ext)
     
-    def calculate_enzyme_expression(self, t7_activity, current_fold):
-        """Calculate enzyme expression dynamics based on T7 activity"""
-        if self.strain_type == 'wildtype':
-            return 0.0
-            
-        t7_signal = (t7_activity**self.n_hill) / (self.K_T7**self.n_hill + t7_activity**self.n_hill)
+    def dydt(self, y, t, t7_activity, out=None):
+        """ODE system for glutamate metabolism model
+
+        Returns a new array unless out (length 10) is given to be filled in place;
+        simulate() passes a per-solve buffer since odeint copies each result.
+        """
+        Glc_ext, NH4_ext, ICIT, AKG, Glu_in, NADPH, X, Glu_ext, fold_ICD, fold_GDH = y
+        
+        if callable(t7_activity):
+            T7_current = t7_activity(t)
+        else:
+            T7_current = t7_activity
+        
+        # Basic reaction rates (growth and uptake share the glucose saturation term)
+        f_glc = self.glucose_saturation(Glc_ext)
+        mu = self.mu_max * f_glc
+        q_glc = self.V_max_glc * f_glc
+        v_TCAin = self.f_TCA * q_glc
+        
+        # Enzyme reactions
+        V_max_ICD = self.V_max_base_ICD * fold_ICD
+        v_ICD = V_max_ICD * ICIT / (self.K_m_ICD + ICIT)
+        
+        V_max_GDH = self.V_max_base_GDH * fold_GDH
+        f_AKG = AKG / (self.K_m_AKG + AKG)
+        f_NH4 = NH4_ext / (self.K_m_NH4 + NH4_ext)
+        f_NADPH = NADPH / (self.K_m_NADPH + NADPH)
+        v_GDH = V_max_GDH * f_AKG * f_NH4 * f_NADPH
         
+        # NADPH dynamics
+        v_NADPH_production = (self.k_PPP * q_glc + self.y_ICD_NADPH * v_ICD) * X
+        v_relax = self.lambda_NADPH * (self.NADPH_set - NADPH)
+        
+        # Regulation terms
+        akg_homeostasis_term = self.apply_akg_homeostasis(AKG, fold_GDH)
+        
+        # Enzyme expression dynamics (T7 Hill signal shared by both enzymes)
+        t7_signal = self.calculate_t7_signal(T7_current)
+        dfold_ICD_dt = self.calculate_enzyme_expression(t7_signal, fold_ICD)
+        dfold_GDH_dt = self.calculate_enzyme_expression(t7_signal, fold_GDH)
+        
+        # ODE system
+        dGlc_ext_dt = -q_glc * X
+        dNH4_ext_dt = -v_GDH * X
+        dICIT_dt = (v_TCAin - v_ICD) * X - mu * ICIT
+        dAKG_dt = (v_ICD - v_GDH) * X - mu * AKG + akg_homeostasis_term
+        dNADPH_dt = (v_NADPH_production - v_GDH * X + v_relax)
+        dX_dt = mu * X - self.k_maintenance * X
+        
+        # Strain-specific glutamate dynamics
+        dGlu_in_dt, dGlu_ext_dt = self.calculate_glu_dynamics(Glu_in, Glu_ext, X, mu, v_GDH, fold_GDH, t)
+        
+        dy = np.empty(10) if out is None else out
+        dy[0] = dGlc_ext_dt
+        dy[1] = dNH4_ext_dt
+        dy[2] = dICIT_dt
+        dy[3] = dAKG_dt
+        dy[4] = dGlu_in_dt
+        dy[5] = dNADPH_dt
+        dy[6] = dX_dt
+        dy[7] = dGlu_ext_dt
+        dy[8] = dfold_ICD_dt
+        dy[9] = dfold_GDH_dt
+        return dy
+    
+    def time_grid(self, t_end=48.0, dt=0.1):
+        """Output time grid used by simulate(): np.arange(0, t_end, dt), at least one point"""
+        # Tolerant ceil: np.arange(0, t_end, dt) can gain a point from float error (e.g. 0.07/0.01)
+        n = max(int(np.ceil(t_end / dt - 1e-9)), 1)
+        return np.arange(n) * dt
+
+    def _t7_lookup(self, t7_grid, t):
+        """Piecewise-constant T7(t) from values precomputed on the time grid"""
+        t7_grid = np.asarray(t7_grid, dtype=float)
+        if t7_grid.shape != t.shape:
+            raise ValueError(f"T7 profile has shape {t7_grid.shape}, expected {t.shape} (one value per time point)")
+        last = len(t) - 1
+
+        def t7_function(t_query):
+            idx = np.searchsorted(t, t_query, side='right') - 1
+            return t7_grid[min(max(idx, 0), last)]
+        return t7_function
+
+    def simulate(self, t7_activity_func, t_end=48.0, dt=0.1, initial_conditions=None):
+        """Run simulation
+
+        t7_activity_func may be a constant, a function of time, or an array
+        aligned with time_grid(t_end, dt), e.g. T7 precomputed once with
+        SimpleANDGate.get_t7_activity(O2_t, Temp_t). Array profiles are held
+        constant between grid points.
+        """
+        t = self.time_grid(t_end, dt)
+        if isinstance(t7_activity_func, np.ndarray):
+            t7_activity_func = self._t7_lookup(t7_activity_func, t)
+
+        if initial_conditions is None:
+            y0 = [50.0, 10.0, 0.1, 0.5, 20.0, 0.10, 0.1, 0.0, 1.0, 1.0]
+        else:
+            y0 = [
+                initial_conditions.get('Glc_ext', 50.0),
+                initial_conditions.get('NH4_ext', 10.0),
+                initial_conditions.get('ICIT', 0.1),
+                initial_conditions.get('AKG', 0.5),
+                initial_conditions.get('Glu_in', 20.0),
+                initial_conditions.get('NADPH', 0.10),
+                initial_conditions.get('X', 0.1),
+                initial_conditions.get('Glu_ext', 0.0),
+                initial_conditions.get('fold_ICD', 1.0),
+                initial_conditions.get('fold_GDH', 1.0)
+            ]
+        
+        # Private derivative buffer for this solve only (odeint copies every RHS result)
+        dy = np.empty(10)
+        solution = odeint(self.dydt, y0, t, args=(t7_activity_func, dy))
+        return t, solution
+    
+    def analyze_performance(self, t, solution):
+        """Analyze performance metrics"""
+        Glu_in = solution[:, 4]
+        Glu_ext = solution[:, 7]
+        fold_GDH = solution[:, 9]
+        
+        heat_shock_mask = fold_GDH > 10.0
+        dt = t[1] - t[0] if len(t) > 1 else 0.0  # single-point grid when t_end <= dt
+        
+        return {
+            'max_intracellular_glu': np.max(Glu_in),
+            'max_extracellular_glu': np.max(Glu_ext),
+            'final_intracellular_glu': Glu_in[-1],
+            'final_extracellular_glu': Glu_ext[-1],
+            'heat_shock_duration': np.sum(heat_shock_mask) * dt,
+            'targets_met': {
+                'intracellular_peak_50mM': np.max(Glu_in) >= 45.0,
+                'extracellular_peak_30mM': np.max(Glu_ext) >= 30.0,
+                'final_recovery_20mM': abs(Glu_in[-1] - 20.0) <= 8.0
+            }
+        }
+
+
+class EngineeredGluModel(GluModel):
+    """Engineered strain: T7-driven ICD/GDH overexpression and Glu export"""
+
+    def _init_strain_params(self, params):
+        self.fold_ICD_max = params.get('fold_ICD_max', 1000.0)
+        self.fold_GDH_max = params.get('fold_GDH_max', 1500.0)
+        self.homeostasis_strength = 2.0
+        self.accum_threshold = params.get('accum_threshold', 55.0)
+        self.export_accum_suppression = params.get('export_accum_suppression', 0.05)
+        self.postshock_export_boost = params.get('postshock_export_boost', 10.0)
+        self.extracellular_clearance_rate = params.get('extracellular_clearance_rate', 0.5)
+        self.export_decay_rate = params.get('export_decay_rate', 0.8)
+
+    def calculate_t7_signal(self, t7_activity):
+        """Hill activation of enzyme expression by T7 activity (0..1)"""
+        t7_n = t7_activity**self.n_hill
+        return t7_n / (self.K_T7**self.n_hill + t7_n)
+
+    def calculate_enzyme_expression(self, t7_signal, current_fold):
+        """Calculate enzyme expression dynamics from the T7 Hill signal"""
         if 'ICD' in str(current_fold):
             target = 1.0 + (self.fold_ICD_max - 1.0) * t7_signal
         else:
@@ -94,9 +249,6 @@ class GluModel:
     
     def calculate_export_rate(self, Glu_in, fold_GDH, t_current):
         """Calculate glutamate export rate based on conditions"""
-        if self.strain_type == 'wildtype':
-            return self.k_sec_base * 0.1
-            
         # Export strategy for engineered strain
         if fold_GDH > 10.0 and Glu_in < self.accum_threshold:
             return self.k_sec_base 
@@ -105,12 +257,8 @@ class GluModel:
         else:
             return self.k_sec_base
     
-    def calculate_dynamic_export_net_rate(self, Glu_in, Glu_ext, fold_GDH, t_current):
-        """Calculate net export rate considering secretion and clearance"""
-        if self.strain_type == 'wildtype':
-            return 0.0
-            
-        k_sec = self.calculate_export_rate(Glu_in, fold_GDH, t_current)
+    def calculate_dynamic_export_net_rate(self, Glu_in, Glu_ext, fold_GDH, t_current, k_sec):
+        """Calculate net export rate considering secretion and clearance (k_sec from calculate_export_rate)"""
         v_secretion = k_sec * Glu_in * 0.1
 
         heat_shock_active = fold_GDH > 10.0
@@ -123,9 +271,11 @@ class GluModel:
             v_clearance = self.extracellular_clearance_rate * 0.01 * Glu_ext
         else:
             # Post-heat shock clearance dynamics
-            time_since_heat_shock = max(0, t_current - 12.0)
+            time_since_heat_shock = t_current - 12.0 if t_current > 12.0 else 0.0
             if time_since_heat_shock > 2.0:
-                clearance_enhancement = min(3.0, 1.0 + (time_since_heat_shock - 2.0) * 0.2)
+                clearance_enhancement = 1.0 + (time_since_heat_shock - 2.0) * 0.2
+                if clearance_enhancement > 3.0:
+                    clearance_enhancement = 3.0
                 v_clearance = self.extracellular_clearance_rate * clearance_enhancement * Glu_ext
             else:
                 v_clearance = self.extracellular_clearance_rate * 0.2 * Glu_ext
@@ -133,17 +283,17 @@ class GluModel:
             # Export decay over time
             time_post_shock = t_current - 12.0
             if time_post_shock > 0:
-                export_decay_factor = np.exp(-self.export_decay_rate * time_post_shock) * 0.5
+                export_decay_factor = exp(-self.export_decay_rate * time_post_shock) * 0.5
                 v_secretion = v_secretion * export_decay_factor
         
         return v_secretion - v_clearance
-
+    
     def apply_homeostasis(self, Glu_in, fold_GDH):
         """Apply glutamate homeostasis correction"""
         deviation = Glu_in - self.Glu_target
         base_correction = -self.homeostasis_strength * deviation
         
-        if self.strain_type == 'engineered' and fold_GDH > 10.0:
+        if fold_GDH > 10.0:
             return base_correction * 0  # Disable homeostasis during heat shock
         else:
             return base_correction
@@ -153,19 +303,13 @@ class GluModel:
         deviation = AKG - 0.5
         base_correction = -2.0 * deviation
         
-        if self.strain_type == 'wildtype':
-            return base_correction
+        if fold_GDH > 10.0:
+            return base_correction * 0.1  # Reduced during heat shock
         else:
-            if fold_GDH > 10.0:
-                return base_correction * 0.1  # Reduced during heat shock
-            else:
-                return base_correction * 2.0  # Enhanced post-shock
+            return base_correction * 2.0  # Enhanced post-shock
     
     def calculate_dynamic_glu_regulation(self, Glu_in, fold_GDH, v_GDH, t_current):
         """Calculate dynamic glutamate regulation for enhanced accumulation"""
-        if self.strain_type == 'wildtype':
-            return 0.0
-        
         # Pre-heat shock baseline regulation
         if t_current < 8.0:
             return 2.0
@@ -177,7 +321,9 @@ class GluModel:
         if heat_shock_active:
             # Enhanced Glu accumulation during heat shock
             base_synthesis = 50.0 * gdh_activity_ratio
-            fold_amplification = min(fold_GDH / 5.0, 30.0)
+            fold_amplification = fold_GDH / 5.0
+            if fold_amplification > 30.0:
+                fold_amplification = 30.0
             
             # Accumulation boost factor: continue promoting even near target
             if Glu_in < 50.0:
@@ -190,12 +336,16 @@ class GluModel:
             
         else:
             # Extended stabilization period, delayed regression
-            time_since_heat_shock = max(0, t_current - 15.0)
+            time_since_heat_shock = t_current - 15.0 if t_current > 15.0 else 0.0
             
             if gdh_activity_ratio < 0.3:  # Delayed regression trigger
-                glu_excess = max(0, Glu_in - 25.0)  # Allow higher steady state
-                activity_factor = max(0.05, 1.0 - gdh_activity_ratio)
-                time_factor = min(1.5, time_since_heat_shock * 0.3)
+                glu_excess = Glu_in - 25.0 if Glu_in > 25.0 else 0.0  # Allow higher steady state
+                activity_factor = 1.0 - gdh_activity_ratio
+                if activity_factor < 0.05:
+                    activity_factor = 0.05
+                time_factor = time_since_heat_shock * 0.3
+                if time_factor > 1.5:
+                    time_factor = 1.5
                 
                 # Weakened regression strength
                 regression_strength = -1.0 * glu_excess * activity_factor * (1 + time_factor)
@@ -210,114 +360,60 @@ class GluModel:
                 else:
                     # Final slow regression phase
                     glu_deviation = Glu_in - 25.0  # Higher target than baseline
-                    activity_factor = max(0.05, 1.0 - gdh_activity_ratio)
+                    activity_factor = 1.0 - gdh_activity_ratio
+                    if activity_factor < 0.05:
+                        activity_factor = 0.05
                     slow_regression = -3.0 * glu_deviation * activity_factor if glu_deviation > 0 else 0.0
                     return slow_regression
-    
-    def dydt(self, y, t, t7_activity):
-        """ODE system for glutamate metabolism model"""
-        Glc_ext, NH4_ext, ICIT, AKG, Glu_in, NADPH, X, Glu_ext, fold_ICD, fold_GDH = y
-        
-        if callable(t7_activity):
-            T7_current = t7_activity(t)
-        else:
-            T7_current = t7_activity
-        
-        # Basic reaction rates
-        mu = self.calculate_growth_rate(Glc_ext)
-        q_glc = self.calculate_glucose_uptake(Glc_ext, X)
-        v_TCAin = self.f_TCA * q_glc
-        
-        # Enzyme reactions
-        V_max_ICD = self.V_max_base_ICD * fold_ICD
-        v_ICD = V_max_ICD * ICIT / (self.K_m_ICD + ICIT)
-        
-        V_max_GDH = self.V_max_base_GDH * fold_GDH
-        f_AKG = AKG / (self.K_m_AKG + AKG)
-        f_NH4 = NH4_ext / (self.K_m_NH4 + NH4_ext)
-        f_NADPH = NADPH / (self.K_m_NADPH + NADPH)
-        v_GDH = V_max_GDH * f_AKG * f_NH4 * f_NADPH
-        
-        # NADPH dynamics
-        v_NADPH_production = (self.k_PPP * q_glc + self.y_ICD_NADPH * v_ICD) * X
-        v_relax = self.lambda_NADPH * (self.NADPH_set - NADPH)
-        
-        # Export and regulation terms
+
+    def calculate_glu_dynamics(self, Glu_in, Glu_ext, X, mu, v_GDH, fold_GDH, t):
+        """Intracellular and extracellular glutamate derivatives"""
         k_sec = self.calculate_export_rate(Glu_in, fold_GDH, t)
         v_sec = k_sec * Glu_in * 0.5
-        homeostasis_term = self.apply_homeostasis(Glu_in, fold_GDH)
-        akg_homeostasis_term = self.apply_akg_homeostasis(AKG, fold_GDH)
-        dynamic_glu_regulation = self.calculate_dynamic_glu_regulation(Glu_in, fold_GDH, v_GDH, t)
-        
-        # Enzyme expression dynamics
-        dfold_ICD_dt = self.calculate_enzyme_expression(T7_current, fold_ICD)
-        dfold_GDH_dt = self.calculate_enzyme_expression(T7_current, fold_GDH)
-        
-        # ODE system
-        dGlc_ext_dt = -q_glc * X
-        dNH4_ext_dt = -v_GDH * X
-        dICIT_dt = (v_TCAin - v_ICD) * X - mu * ICIT
-        dAKG_dt = (v_ICD - v_GDH) * X - mu * AKG + akg_homeostasis_term
-        dNADPH_dt = (v_NADPH_production - v_GDH * X + v_relax)
-        dX_dt = mu * X - self.k_maintenance * X
-        
-        # Strain-specific glutamate dynamics
-        if self.strain_type == 'wildtype':
-            dGlu_ext_dt = 0.0
-            dGlu_in_dt = 0.0  # Maintain stable Glu_in for wild-type
-        else:
-            if t < 8.0:
-                dGlu_in_dt = (1.0 - v_sec * 0.1) * X  # Pre-heat shock stability
-            else:
-                dGlu_in_dt = (v_GDH * X - v_sec * 0.01 * X - mu * Glu_in + homeostasis_term + dynamic_glu_regulation)
-            dGlu_ext_dt = self.calculate_dynamic_export_net_rate(Glu_in, Glu_ext, fold_GDH, t) * X
-        
-        return [dGlc_ext_dt, dNH4_ext_dt, dICIT_dt, dAKG_dt, dGlu_in_dt, 
-                dNADPH_dt, dX_dt, dGlu_ext_dt, dfold_ICD_dt, dfold_GDH_dt]
-    
-    def simulate(self, t7_activity_func, t_end=48.0, dt=0.1, initial_conditions=None):
-        """Run simulation"""
-        t = np.arange(0, t_end, dt)
         
-        if initial_conditions is None:
-            y0 = [50.0, 10.0, 0.1, 0.5, 20.0, 0.10, 0.1, 0.0, 1.0, 1.0]
+        if t < 8.0:
+            dGlu_in_dt = (1.0 - v_sec * 0.1) * X  # Pre-heat shock stability
         else:
-            y0 = [
-                initial_conditions.get('Glc_ext', 50.0),
-                initial_conditions.get('NH4_ext', 10.0),
-                initial_conditions.get('ICIT', 0.1),
-                initial_conditions.get('AKG', 0.5),
-                initial_conditions.get('Glu_in', 20.0),
-                initial_conditions.get('NADPH', 0.10),
-                initial_conditions.get('X', 0.1),
-                initial_conditions.get('Glu_ext', 0.0),
-                initial_conditions.get('fold_ICD', 1.0),
-                initial_conditions.get('fold_GDH', 1.0)
-            ]
-        
-        solution = odeint(self.dydt, y0, t, args=(t7_activity_func,))
-        return t, solution
-    
-    def analyze_performance(self, t, solution):
-        """Analyze performance metrics"""
-        Glu_in = solution[:, 4]
-        Glu_ext = solution[:, 7]
-        fold_GDH = solution[:, 9]
-        
-        heat_shock_mask = fold_GDH > 10.0
-        
-        return {
-            'max_intracellular_glu': np.max(Glu_in),
-            'max_extracellular_glu': np.max(Glu_ext),
-            'final_intracellular_glu': Glu_in[-1],
-            'final_extracellular_glu': Glu_ext[-1],
-            'heat_shock_duration': np.sum(heat_shock_mask) * (t[1] - t[0]),
-            'targets_met': {
-                'intracellular_peak_50mM': np.max(Glu_in) >= 45.0,
-                'extracellular_peak_30mM': np.max(Glu_ext) >= 30.0,
-                'final_recovery_20mM': abs(Glu_in[-1] - 20.0) <= 8.0
-            }
-        }
+            homeostasis_term = self.apply_homeostasis(Glu_in, fold_GDH)
+            dynamic_glu_regulation = self.calculate_dynamic_glu_regulation(Glu_in, fold_GDH, v_GDH, t)
+            dGlu_in_dt = (v_GDH * X - v_sec * 0.01 * X - mu * Glu_in + homeostasis_term + dynamic_glu_regulation)
+        dGlu_ext_dt = self.calculate_dynamic_export_net_rate(Glu_in, Glu_ext, fold_GDH, t, k_sec) * X
+        return dGlu_in_dt, dGlu_ext_dt
+
+
+class WildtypeGluModel(GluModel):
+    """Wild-type strain: homeostatic control, no response to heat shock"""
+
+    def _init_strain_params(self, params):
+        self.fold_ICD_max = 1.0
+        self.fold_GDH_max = 1.0
+        self.homeostasis_strength = 5.0
+
+    def calculate_t7_signal(self, t7_activity):
+        return 0.0
+
+    def calculate_enzyme_expression(self, t7_signal, current_fold):
+        return 0.0
+
+    def calculate_export_rate(self, Glu_in, fold_GDH, t_current):
+        return self.k_sec_base * 0.1
+
+    def calculate_dynamic_export_net_rate(self, Glu_in, Glu_ext, fold_GDH, t_current, k_sec):
+        return 0.0
+
+    def apply_homeostasis(self, Glu_in, fold_GDH):
+        return -self.homeostasis_strength * (Glu_in - self.Glu_target)
+
+    def apply_akg_homeostasis(self, AKG, fold_GDH):
+        return -2.0 * (AKG - 0.5)
+
+    def calculate_dynamic_glu_regulation(self, Glu_in, fold_GDH, v_GDH, t_current):
+        return 0.0
+
+    def calculate_glu_dynamics(self, Glu_in, Glu_ext, X, mu, v_GDH, fold_GDH, t):
+        # Maintain stable Glu_in and no export for wild-type
+        return 0.0, 0.0
+
 
 # === Utility Functions ===
 def create_heat_shock_protocol(shock_start=8.0, shock_duration=4.0, 
@@ -339,6 +435,9 @@ if __name__ == '__main__':
     import matplotlib.pyplot as plt
     import os
 
+    # Headless: the figure is only saved, never shown
+    plt.switch_backend("Agg")
+
     print("=" * 60)
     print("    iGEM Engineered Bacteria Glutamate Metabolism Model Validation")
     print("=" * 60)
@@ -464,8 +563,7 @@ if __name__ == '__main__':
         plt.savefig(os.path.join(results_dir, 'glu_model_simplified_en.png'), 
                    dpi=300, bbox_inches='tight')
         print(f"\n✓ Analysis plot saved: results/glu_model_simplified_en.png")
-        
-        plt.show()
+        plt.close(fig)
         
     except Exception as e:
         print(f"\nPlot generation failed: {e}")